@@ -12,37 +12,73 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import torch
 from transformers import (
+    AutoModelForMaskedLM,
     CamembertTokenizer,
     pipeline,
 )
-import random
-from typing import List
+from typing import Dict, List, Tuple
 
 model_name = "airesearch/wangchanberta-base-att-spm-uncased"
 
+# tokenizer and fill-mask pipeline, shared between instances and
+# keyed by model name, so repeat constructions do not reload weights
+_PIPELINE_CACHE: Dict[str, Tuple[CamembertTokenizer, object]] = {}
 
-class Thai2transformersAug:
-    def __init__(self):
-        self.model_name = "airesearch/wangchanberta-base-att-spm-uncased"
-        self.target_tokenizer = CamembertTokenizer
-        self.tokenizer = CamembertTokenizer.from_pretrained(
-            self.model_name, revision="main"
+
+def _load_fill_mask_pipeline(
+    model_name: str,
+) -> Tuple[CamembertTokenizer, object]:
+    if model_name not in _PIPELINE_CACHE:
+        tokenizer = CamembertTokenizer.from_pretrained(
+            model_name, revision="main"
         )
-        self.tokenizer.additional_special_tokens = [
+        tokenizer.additional_special_tokens = [
             "<s>NOTUSED",
             "</s>NOTUSED",
             "<_>",
         ]
-        self.fill_mask = pipeline(
+        model = AutoModelForMaskedLM.from_pretrained(
+            model_name, revision="main"
+        )
+        if torch.cuda.is_available():
+            # half precision roughly doubles masked-LM throughput on GPU
+            dtype = (
+                torch.bfloat16
+                if torch.cuda.is_bf16_supported()
+                else torch.float16
+            )
+            model = model.to(device="cuda", dtype=dtype)
+            device = 0
+        else:
+            device = -1
+        fill_mask = pipeline(
             task="fill-mask",
-            tokenizer=self.tokenizer,
-            model=f"{self.model_name}",
-            revision="main",
+            tokenizer=tokenizer,
+            model=model,
+            device=device,
+        )
+        _PIPELINE_CACHE[model_name] = (tokenizer, fill_mask)
+
+    return _PIPELINE_CACHE[model_name]
+
+
+class Thai2transformersAug:
+    def __init__(self):
+        self.model_name = "airesearch/wangchanberta-base-att-spm-uncased"
+        self.target_tokenizer = CamembertTokenizer
+        self.tokenizer, self.fill_mask = _load_fill_mask_pipeline(
+            self.model_name
         )
         self.MASK_TOKEN = self.tokenizer.mask_token
 
-    def generate(self, sentence: str, num_replace_tokens: int = 3):
+    def generate(
+        self,
+        sentence: str,
+        num_replace_tokens: int = 3,
+        top_k: int = 5,
+    ):
         self.sent2 = []
         self.input_text = sentence
         sent = [
@@ -50,26 +86,31 @@ class Thai2transformersAug:
         ]
         if len(sent) < num_replace_tokens:
             num_replace_tokens = len(sent)
-        masked_text = self.input_text
-        for i in range(num_replace_tokens):
-            replace_token = [
-                sent.pop(random.randrange(len(sent))) for _ in range(1)
-            ][0]
-            masked_text = masked_text + self.MASK_TOKEN
-            self.sent2 += [
-                str(j["sequence"]).replace("<s> ", "").replace("</s>", "")
-                for j in self.fill_mask(masked_text)
-                if j["sequence"] not in self.sent2
-            ]
-            masked_text = self.input_text
+        if num_replace_tokens < 1:
+            return self.sent2
+        # every replaced token used the same masked input, so a single
+        # forward pass produces the same candidates as one pass per token
+        masked_text = self.input_text + self.MASK_TOKEN
+        # decode only as many candidates as requested
+        self.sent2 += [
+            str(j["sequence"]).replace("<s> ", "").replace("</s>", "")
+            for j in self.fill_mask(masked_text, top_k=top_k)
+            if j["sequence"] not in self.sent2
+        ]
         return self.sent2
 
-    def augment(self, sentence: str, num_replace_tokens: int = 3) -> List[str]:
+    def augment(
+        self,
+        sentence: str,
+        num_replace_tokens: int = 3,
+        top_k: int = 5,
+    ) -> List[str]:
         """
         Text Augment from wangchanberta
 
         :param str sentence: thai sentence
         :param int num_replace_tokens: number replace tokens
+        :param int top_k: number of candidates to decode per replaced token
 
         :return: list of text augment
         :rtype: List[str]
@@ -88,6 +129,4 @@ class Thai2transformersAug:
              'ช้างมีทั้งหมด 50 ตัว บนนั้น',
              'ช้างมีทั้งหมด 50 ตัว บนหัว']
         """
-        self.sent2 = []
-        self.sent2 = self.generate(sentence, num_replace_tokens)
-        return self.sent2
+        return self.generate(sentence, num_replace_tokens, top_k=top_k)
@@ -40,6 +40,7 @@ __all__ = [
     "reign_year_to_ad",
     "remove_dangling",
     "remove_dup_spaces",
+    "remove_repeat_consonants",
     "remove_repeat_vowels",
     "remove_tonemark",
     "remove_zw",
@@ -95,6 +96,7 @@ from pythainlp.util.normalize import (
     maiyamok,
     remove_dangling,
     remove_dup_spaces,
+    remove_repeat_consonants,
     remove_repeat_vowels,
     remove_tonemark,
     remove_zw,
@@ -16,49 +16,64 @@
 Text normalization
 """
 import re
-from typing import List, Union
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
 
 from pythainlp import thai_above_vowels as above_v
 from pythainlp import thai_below_vowels as below_v
+from pythainlp import thai_consonants
 from pythainlp import thai_follow_vowels as follow_v
 from pythainlp import thai_lead_vowels as lead_v
 from pythainlp import thai_tonemarks as tonemarks
-from pythainlp.tokenize import word_tokenize
+from pythainlp.tokenize import DEFAULT_WORD_DICT_TRIE, word_tokenize
+from pythainlp.util.trie import Trie
 
 
 _DANGLING_CHARS = f"{above_v}{below_v}{tonemarks}\u0e3a\u0e4c\u0e4d\u0e4e"
-_RE_REMOVE_DANGLINGS = re.compile(f"^[{_DANGLING_CHARS}]+")
+_DANGLING_SET = frozenset(_DANGLING_CHARS)
 
 _ZERO_WIDTH_CHARS = "\u200b\u200c"  # ZWSP, ZWNJ
+_ZW_DELETE = str.maketrans("", "", _ZERO_WIDTH_CHARS)
+
+_TONEMARK_DELETE = str.maketrans("", "", tonemarks)
 
 _REORDER_PAIRS = [
-    ("\u0e40\u0e40", "\u0e41"),  # Sara E + Sara E -> Sara Ae
-    (
-        f"([{tonemarks}\u0e4c]+)([{above_v}{below_v}]+)",
-        "\\2\\1",
-    ),  # TONE/Thanthakhat + ABV/BLW VOWEL -> ABV/BLW VOWEL + TONE/Thanthakhat
-    (
-        f"\u0e4d([{tonemarks}]*)\u0e32",
-        "\\1\u0e33",
-    ),  # Nikhahit + TONEMARK + Sara Aa -> TONEMARK + Sara Am
-    (
-        f"([{follow_v}]+)([{tonemarks}]+)",
-        "\\2\\1",
-    ),  # FOLLOW VOWEL + TONEMARK+ -> TONEMARK + FOLLOW VOWEL
-    ("([^\u0e24\u0e26])\u0e45", "\\1\u0e32"),  # Lakkhangyao -> Sara Aa
+    (re.compile(pattern), replacement)
+    for pattern, replacement in [
+        ("\u0e40\u0e40", "\u0e41"),  # Sara E + Sara E -> Sara Ae
+        # TONE/Thanthakhat + ABV/BLW VOWEL ->
+        # ABV/BLW VOWEL + TONE/Thanthakhat
+        (
+            f"([{tonemarks}\u0e4c]+)([{above_v}{below_v}]+)",
+            "\\2\\1",
+        ),
+        (
+            f"\u0e4d([{tonemarks}]*)\u0e32",
+            "\\1\u0e33",
+        ),  # Nikhahit + TONEMARK + Sara Aa -> TONEMARK + Sara Am
+        (
+            f"([{follow_v}]+)([{tonemarks}]+)",
+            "\\2\\1",
+        ),  # FOLLOW VOWEL + TONEMARK+ -> TONEMARK + FOLLOW VOWEL
+        ("([^\u0e24\u0e26])\u0e45", "\\1\u0e32"),  # Lakkhangyao -> Sara Aa
+    ]
 ]
 
 # VOWELS + Phinthu, Thanthakhat, Nikhahit, Yamakkan
 _NOREPEAT_CHARS = (
     f"{follow_v}{lead_v}{above_v}{below_v}\u0e3a\u0e4c\u0e4d\u0e4e"
 )
-_NOREPEAT_PAIRS = list(
-    zip([f"({ch}[ ]*)+{ch}" for ch in _NOREPEAT_CHARS], _NOREPEAT_CHARS)
-)
+_RE_NOREPEAT = re.compile(f"([{_NOREPEAT_CHARS}])(?:[ ]*\\1)+")
 
 _RE_TONEMARKS = re.compile(f"[{tonemarks}]+")
 
+# characters that remove_repeat_vowels() could possibly rewrite
+_RE_MAYBE_NOREPEAT = re.compile(f"[{_NOREPEAT_CHARS}{tonemarks}]")
+
 _RE_REMOVE_NEWLINES = re.compile("[ \n]*\n[ \n]*")
+_RE_DUP_SPACES = re.compile(" {2,}")
+
+_RE_NONWHITESPACE = re.compile(r"\S+")
 
 
 def _last_char(matchobj):  # to be used with _RE_NOREPEAT_TONEMARKS
@@ -90,7 +105,12 @@ def remove_dangling(text: str) -> str:
         remove_dangling('๊ก')
         # output: 'ก'
     """
-    return _RE_REMOVE_DANGLINGS.sub("", text)
+    i = 0
+    n = len(text)
+    while i < n and text[i] in _DANGLING_SET:
+        i += 1
+
+    return text[i:] if i else text
 
 
 def remove_dup_spaces(text: str) -> str:
@@ -112,8 +132,7 @@ def remove_dup_spaces(text: str) -> str:
         remove_dup_spaces('ก    ข    ค')
         # output: 'ก ข ค'
     """
-    while "  " in text:
-        text = text.replace("  ", " ")
+    text = _RE_DUP_SPACES.sub(" ", text)
     text = _RE_REMOVE_NEWLINES.sub("\n", text)
     text = text.strip()
     return text
@@ -146,10 +165,7 @@ def remove_tonemark(text: str) -> str:
         remove_tonemark('สองพันหนึ่งร้อยสี่สิบเจ็ดล้านสี่แสนแปดหมื่นสามพันหกร้อยสี่สิบเจ็ด')
         # output: สองพันหนึงรอยสีสิบเจ็ดลานสีแสนแปดหมืนสามพันหกรอยสีสิบเจ็ด
     """
-    for ch in tonemarks:
-        while ch in text:
-            text = text.replace(ch, "")
-    return text
+    return text.translate(_TONEMARK_DELETE)
 
 
 def remove_zw(text: str) -> str:
@@ -168,11 +184,7 @@ def remove_zw(text: str) -> str:
     :return: text without zero-width characters
     :rtype: str
     """
-    for ch in _ZERO_WIDTH_CHARS:
-        while ch in text:
-            text = text.replace(ch, "")
-
-    return text
+    return text.translate(_ZW_DELETE)
 
 
 def reorder_vowels(text: str) -> str:
@@ -191,8 +203,8 @@ def reorder_vowels(text: str) -> str:
     :return: text with vowels and tone marks in the standard logical order
     :rtype: str
     """
-    for pair in _REORDER_PAIRS:
-        text = re.sub(pair[0], pair[1], text)
+    for pattern, replacement in _REORDER_PAIRS:
+        text = pattern.sub(replacement, text)
 
     return text
 
@@ -209,8 +221,7 @@ def remove_repeat_vowels(text: str) -> str:
     :rtype: str
     """
     text = reorder_vowels(text)
-    for pair in _NOREPEAT_PAIRS:
-        text = re.sub(pair[0], pair[1], text)
+    text = _RE_NOREPEAT.sub(lambda m: m.group(1), text)
 
     # remove repeating tone marks, use last tone mark
     text = _RE_TONEMARKS.sub(_last_char, text)
@@ -252,14 +263,226 @@ def normalize(text: str) -> str:
         normalize('นานาาา')
         # output: นานา
     """
-    text = remove_zw(text)
-    text = remove_dup_spaces(text)
-    text = remove_repeat_vowels(text)
-    text = remove_dangling(text)
+    # each rewriter is guarded by a cheap scan, so already-clean text
+    # passes through without paying for the replace machinery
+    if any(ch in text for ch in _ZERO_WIDTH_CHARS):
+        text = remove_zw(text)
+    if (
+        "  " in text
+        or "\n" in text
+        or text[:1].isspace()
+        or text[-1:].isspace()
+    ):
+        text = remove_dup_spaces(text)
+    if _RE_MAYBE_NOREPEAT.search(text):
+        text = remove_repeat_vowels(text)
+    if text and text[0] in _DANGLING_CHARS:
+        text = remove_dangling(text)
 
     return text
 
 
+# consonant repeaters, computed once per dictionary and keyed by
+# the identity of the Trie object. each entry keeps the Trie itself, so
+# the entry can be checked against the passed dictionary and the id can
+# not be reused by another Trie while the entry lives.
+# for each consonant: the length of its longest repeater head, and a map
+# from reversed repeater head to the longest repeater with that head and
+# its number of repeating consonants
+_CONSONANTS_REPEATERS_CACHE: Dict[
+    int, Tuple[Trie, Dict[str, Tuple[int, Dict[str, Tuple[str, int]]]]]
+] = {}
+
+
+def remove_repeat_consonants(
+    text: str, dictionary: Trie = None, dictionary_updated: bool = False
+) -> str:
+    """
+    Remove repeating consonants at the end of words/segments.
+
+    Repeating consonants are kept as they appear in the longest word
+    found in the dictionary that ends with the same repeating consonant.
+    If there is no such word, only one consonant is kept.
+
+    The dictionary is scanned once for words that end with repeating
+    consonants and the result is cached, so later calls with the same
+    dictionary do not pay the scan again.
+
+    :param str text: input text
+    :param Trie dictionary: Trie dictionary to check the last word against
+                            (default is pythainlp.corpus.thai_words())
+    :param bool dictionary_updated: set to True to force a rescan of the
+                                    dictionary, e.g. after words have been
+                                    added to or removed from it
+    :return: text without repeating Thai consonants
+    :rtype: str
+
+    :Example:
+    ::
+
+        from pythainlp.util import remove_repeat_consonants
+
+        remove_repeat_consonants('อืมมมมมมมมมมมมมมม')
+        # output: อืมมม
+        # ("อืมมม" is in the default dictionary)
+    """
+    if not dictionary:
+        dictionary = DEFAULT_WORD_DICT_TRIE
+
+    repeaters_key = id(dictionary)
+    entry = _CONSONANTS_REPEATERS_CACHE.get(repeaters_key)
+    if dictionary_updated or entry is None or entry[0] is not dictionary:
+        _CONSONANTS_REPEATERS_CACHE[repeaters_key] = (
+            dictionary,
+            _update_consonant_repeaters(dictionary),
+        )
+        # memoized segment results may refer to the replaced table
+        _remove_repeat_consonants_from_segment_cached.cache_clear()
+
+    # visit only the non-whitespace runs, keeping all whitespace verbatim
+    return _RE_NONWHITESPACE.sub(
+        lambda m: _remove_repeat_consonants_from_segment_cached(
+            m.group(0), repeaters_key
+        ),
+        text,
+    )
+
+
+@lru_cache(maxsize=100_000)
+def _remove_repeat_consonants_from_segment_cached(
+    segment: str, repeaters_key: int
+) -> str:
+    """
+    Memoized front end of _remove_repeat_consonants_from_segment.
+
+    The same segments recur frequently in paragraph-level input,
+    so their results are kept in a bounded cache.
+    """
+    return _remove_repeat_consonants_from_segment(
+        segment, _CONSONANTS_REPEATERS_CACHE[repeaters_key][1]
+    )
+
+
+def _remove_repeat_consonants_from_segment(
+    segment: str,
+    consonants_repeaters: Dict[str, Tuple[int, Dict[str, Tuple[str, int]]]],
+) -> str:
+    """
+    Remove repeating consonants at the end of a segment.
+    """
+    # skip if the segment does not end with a repeated Thai consonant
+    if not (
+        len(segment) > 1
+        and segment[-1] in thai_consonants
+        and segment[-1] == segment[-2]
+    ):
+        return segment
+
+    # the repeating character
+    dup = segment[-1]
+
+    repeaters = consonants_repeaters[dup]
+    if not repeaters[1]:
+        # no dictionary word ends with this repeating consonant,
+        # keep only one without searching
+        return segment.rstrip(dup) + dup
+
+    # segment without the repetition at the end
+    segment_head = _get_repitition_head(segment, dup)
+
+    # find the longest dictionary word matching the end of the segment
+    longest_match, repetition = _find_longest_consonant_repeaters_match(
+        segment_head, repeaters
+    )
+
+    if longest_match:
+        # keep as many consonants as the matched word has
+        return segment_head + (dup * repetition)
+
+    # no known word ends with this repeating consonant, keep only one
+    return segment_head + dup
+
+
+def _get_repitition_head(text: str, dup: str) -> str:
+    """
+    Get the text without the repetition of dup at the end.
+    """
+    return text.rstrip(dup)
+
+
+def _is_consonant_repeater(word: str) -> bool:
+    """
+    Check if the word ends with a repeating consonant.
+    """
+    return (
+        len(word) > 1 and word[-1] == word[-2] and word[-1] in thai_consonants
+    )
+
+
+def _update_consonant_repeaters(
+    dictionary: Trie,
+) -> Dict[str, Tuple[int, Dict[str, Tuple[str, int]]]]:
+    """
+    Collect words that end with repeating consonants from the dictionary
+    and index them for suffix lookup.
+
+    For each consonant, repeater heads (the words without their repeating
+    consonants) are reversed and kept in a flat hash map, keyed by the
+    reversed head, next to the length of the longest head. All heads
+    matching the end of a segment can then be found with direct probes on
+    the reversed segment tail instead of comparing against every repeater
+    word.
+    """
+    repeater_words: Dict[str, List[str]] = {
+        consonant: [] for consonant in thai_consonants
+    }
+    for word in dictionary:
+        if _is_consonant_repeater(word):
+            repeater_words[word[-1]].append(word)
+
+    consonants_repeaters = {}
+    for consonant, words in repeater_words.items():
+        best_by_rev_head: Dict[str, Tuple[str, int]] = {}
+        for word in words:
+            head = _get_repitition_head(word, consonant)
+            rev_head = head[::-1]
+            best = best_by_rev_head.get(rev_head)
+            if not best or len(word) > len(best[0]):
+                best_by_rev_head[rev_head] = (word, len(word) - len(head))
+        max_rev_head_len = max(map(len, best_by_rev_head), default=0)
+        consonants_repeaters[consonant] = (max_rev_head_len, best_by_rev_head)
+
+    return consonants_repeaters
+
+
+def _find_longest_consonant_repeaters_match(
+    segment_head: str, repeaters: Tuple[int, Dict[str, Tuple[str, int]]]
+) -> Tuple[str, int]:
+    """
+    Find the longest repeater word whose head matches the end of
+    segment_head, and the number of repeating consonants it ends with.
+    """
+    max_rev_head_len, best_by_rev_head = repeaters
+
+    # matching the end of segment_head against repeater heads is a prefix
+    # match between their reversed forms; only the last max_rev_head_len
+    # characters of the segment can take part in a match
+    rev_tail = ""
+    if max_rev_head_len:
+        rev_tail = segment_head[-max_rev_head_len:][::-1]
+
+    longest_match = ""
+    repetition = 0
+    for length in range(len(rev_tail) + 1):
+        # length 0 probes the empty head: words made of
+        # the repeating consonant alone match any segment
+        best = best_by_rev_head.get(rev_tail[:length])
+        if best and len(best[0]) > len(longest_match):
+            longest_match, repetition = best
+
+    return longest_match, repetition
+
+
 def maiyamok(sent: Union[str, List[str]]) -> List[str]:
     """
     Thai MaiYaMok
@@ -284,19 +507,21 @@ def maiyamok(sent: Union[str, List[str]]) -> List[str]:
     """
     if isinstance(sent, str):
         sent = word_tokenize(sent)
-    _list_word = []
-    i = 0
+    output = []
+    n = len(sent)
     for j, text in enumerate(sent):
-        if text.isspace() and "ๆ" in sent[j + 1]:
+        next_text = sent[j + 1] if j + 1 < n else ""
+        if text.isspace() and "ๆ" in next_text:
+            # drop space before a duplicate mark
             continue
         if " ๆ" in text:
             text = text.replace(" ๆ", "ๆ")
-        if "ๆ" == text:
-            text = _list_word[i - 1]
-        elif "ๆ" in text:
+        if text == "ๆ":
+            # duplicate the previous word
+            output.append(output[-1] if output else text)
+            continue
+        if "ๆ" in text:
             text = text.replace("ๆ", "")
-            _list_word.append(text)
-            i += 1
-        _list_word.append(text)
-        i += 1
-    return _list_word
+            output.append(text)
+        output.append(text)
+    return output
@@ -33,6 +33,7 @@ from pythainlp.util import (
     reign_year_to_ad,
     remove_dangling,
     remove_dup_spaces,
+    remove_repeat_consonants,
     remove_tonemark,
     remove_zw,
     text_to_arabic_digit,
@@ -529,6 +530,21 @@ class TestUtilPackage(unittest.TestCase):
         self.assertEqual(remove_dup_spaces("  ab  c d  "), "ab c d")
         self.assertEqual(remove_dup_spaces("\nab  c   \n d \n"), "ab c\nd")
 
+        # remove repeating consonants
+        self.assertEqual(remove_repeat_consonants("อืมมมมมมมมมมมมมมม"), "อืมมม")
+        self.assertEqual(remove_repeat_consonants("ปกติ"), "ปกติ")
+        self.assertEqual(remove_repeat_consonants(""), "")
+        self.assertEqual(
+            remove_repeat_consonants("ดีจังเลยยยย ครับบบ\nเยี่ยมมาก"),
+            "ดีจังเลย ครับ\nเยี่ยมมาก",
+        )
+        self.assertEqual(
+            remove_repeat_consonants(
+                "น่ารักกกกกก", Trie(["น่ารักก"])
+            ),
+            "น่ารักก",
+        )
+
         # remove tone marks
         self.assertEqual(remove_tonemark("จิ้น"), "จิน")
         self.assertEqual(remove_tonemark("เก๋า"), "เกา")